@@ -1,21 +1,29 @@
 # title: 'app'
 # author: 'Elias Albuquerque'
-# version: '0.3.0'
+# version: '0.4.0'
 # created: '2024-08-08'
-# update: '2024-08-14'
+# update: '2026-10-19'
 
 
 import logging
+import argparse
 import json
 import datetime
+import getpass
 import os
 import tempfile
 import shutil
+import threading
 from time import sleep
-from src.settings import Settings
+from src.settings import Settings, setup_logging, get_log_dir
 from src.website import Website
-from src.office import Office
-from src.report import report_content
+from src.output import render_outputs, needs_screenshot
+from src.archive import ReportArchive
+from src.snapshot import SnapshotStore
+from src.workspace import Workspace
+from src.jobqueue import JobQueue
+from src.worker import Worker
+from src.server import QuoteService
 
 
 def get_current_date_time():
@@ -28,6 +36,39 @@ def load_config():
         return json.load(file)
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Extrai a cotação do dólar e gera o relatório.')
+    parser.add_argument(
+        '--enqueue', action='store_true',
+        help='Enfileira um job de scraping para cada alvo do config.json e sai.')
+    parser.add_argument(
+        '--worker', action='store_true',
+        help='Executa como worker, consumindo os jobs da fila.')
+    parser.add_argument(
+        '--worker-id', default=None,
+        help='Identificador do worker (padrão: host-pid).')
+    parser.add_argument(
+        '--drain', action='store_true',
+        help='Com --worker, encerra quando a fila ficar vazia.')
+    parser.add_argument(
+        '--serve', action='store_true',
+        help='Inicia a API HTTP local (/quote e /report).')
+    parser.add_argument(
+        '--archive', action='store_true',
+        help='Move os relatórios antigos para o arquivo compactado e sai.')
+    parser.add_argument(
+        '--restore', metavar='ARQUIVO', default=None,
+        help='Restaura um relatório do arquivo para a pasta reports e sai.')
+    parser.add_argument(
+        '--record', action='store_true',
+        help='Grava a snapshot da página (HTML, valores e screenshot) desta execução.')
+    parser.add_argument(
+        '--replay', metavar='RUN_ID', default=None,
+        help='Refaz os relatórios a partir da snapshot de uma execução, sem navegador.')
+    return parser.parse_args(argv)
+
+
 def string_to_float_to_string(value):
     """
     Converte uma string para um valor float com duas casas decimais.
@@ -42,51 +83,326 @@ def string_to_float_to_string(value):
     return value_rounded
 
 
-def main():
-    # Criar a pasta temporária para salvar o screenshot
-    tempdir = tempfile.mkdtemp()
+def get_author(config):
+    author = config['office']['author']
+    if author == "null":
+        try:
+            author = os.getlogin()
+        except OSError:
+            # Sem terminal de controle (worker, serviço): usa o usuário do processo
+            author = getpass.getuser()
+        author = author.capitalize()
+    return author
 
-    try:
-        # 0. Carrega as configuracoes e variaveis da aplicacao
-        settings = Settings()
-        config = load_config()
 
-        url = config['website']['url']
-        xp_button_cookie = config['website']['xp_button_cookie']
-        xp_quote = config['website']['xp_quote']
-        now = get_current_date_time()
-        today = now.strftime("%d/%m/%Y")
-        hour = now.strftime("%H:%M:%S")
-        author = config['office']['author']
-        if author == "null":
-            author = os.getlogin().capitalize()
+def get_targets(config):
+    """Retorna a lista de sites a serem consultados."""
 
-        report_file = "relatorio-" + now.strftime("%Y%m%d-%H%M%S") + ".docx"
-        report_path = os.path.join('reports', report_file)
+    return config.get('targets', [config['website']])
 
-        # 1. Acessar o site e extrair o valor da cotacao
-        website = Website(settings)
-        website.access_website(url)
-        website.click_on_element(xp_button_cookie)
+
+def get_formats(config):
+    """Retorna os formatos de saída configurados (padrão: Word e PDF)."""
+
+    return config.get('output', {}).get('formats', ['docx', 'pdf'])
+
+
+def open_snapshots(config):
+    return SnapshotStore(config.get('snapshots', {}).get('path', 'snapshots'))
+
+
+def scrape(settings, website_config, tempdir, screenshot=True, recorder=None):
+    """
+    Acessa o site e extrai a cotação e, se pedido, o screenshot.
+    Com um recorder, grava também a snapshot da execução.
+
+    Returns:
+        dict: Dados da cotação (quote, today, hour, timestamp, url, screenshot).
+    """
+
+    url = website_config['url']
+    now = get_current_date_time()
+
+    website = Website(settings, recorder)
+    website.access_website(url)
+    website.click_on_element(website_config['xp_button_cookie'])
+
+    # O zoom só serve para enquadrar o screenshot
+    if screenshot:
         website.zoom_out_of_website(86)
-    
-        quote = website.extract_text_from_element(xp_quote, 'cotação')
-        screenshot = website.take_screenshot(tempdir)
 
-        # 2. Criar arquivo Word.docx montar o relatorio
-        office = Office()
-        office.create_document(report_file, report_path)
+    quote = website.extract_text_from_element(website_config['xp_quote'], 'cotação')
+    screenshot = website.take_screenshot(tempdir) if screenshot else None
+
+    data = {
+        'quote': "R$ " + string_to_float_to_string(quote),
+        'today': now.strftime("%d/%m/%Y"),
+        'hour': now.strftime("%H:%M:%S"),
+        'timestamp': now.strftime("%Y%m%d-%H%M%S"),
+        'url': url,
+        'screenshot': screenshot,
+    }
+
+    website.save_snapshot(data)
+
+    return data
+
+
+def build_report(config, data, report_dir, base_name, formats=None, race=None, author=None):
+    """
+    Gera o relatório nos formatos configurados.
+
+    Args:
+        race (bool, optional): Converte para PDF com dois conversores em paralelo.
+            Padrão 'race_converters' da seção office do config.json.
+        author (str, optional): Autor do relatório. Padrão get_author(config).
+    Returns:
+        dict: Mapeia cada formato gerado para o caminho do arquivo.
+    """
+
+    office_config = config['office']
+    office_options = {
+        'timeout': office_config.get('converter_timeout', 120),
+        'race': office_config.get('race_converters', False) if race is None else race,
+        # Histórico dos conversores na pasta de log da aplicação, não na pasta atual
+        'stats_path': os.path.join(get_log_dir(), 'converters.sqlite3'),
+    }
+
+    return render_outputs(
+        formats or get_formats(config), data, report_dir, base_name, author or get_author(config),
+        screenshot_mode=config.get('output', {}).get('screenshot', 'inline'),
+        office_options=office_options)
+
+
+def open_queue(config):
+    queue_config = config.get('queue', {})
+    return JobQueue(
+        queue_config.get('path', os.path.join('reports', 'queue.sqlite3')),
+        lease_seconds=queue_config.get('lease_seconds', 300),
+        max_attempts=queue_config.get('max_attempts', 3))
+
+
+def enqueue_targets(config):
+    """Produtor: enfileira um job de scraping para cada alvo."""
+
+    queue = open_queue(config)
+    for target in get_targets(config):
+        queue.enqueue('scrape', {'website': target})
+    logging.info(f'Fila: {queue.stats()}')
+
+
+def run_worker(config, worker_id=None, drain=False):
+    """Worker: reserva e executa jobs de scraping e de relatório."""
+
+    queue = open_queue(config)
+    artifacts_dir = os.path.join(os.path.dirname(queue.db_path), 'artifacts')
+    settings = None
+
+    def handle_scrape(job):
+        nonlocal settings
+        if settings is None:
+            settings = Settings(config.get('browser'))
+        settings.ensure_healthy()
+
+        with Workspace() as workspace:
+            recorder = None
+            if config.get('snapshots', {}).get('record', False):
+                recorder = open_snapshots(config).recorder(workspace.run_id)
+
+            data = scrape(
+                settings, job['payload']['website'], workspace.path,
+                screenshot=needs_screenshot(get_formats(config)), recorder=recorder)
+
+            # O screenshot precisa ficar acessível aos workers de outros hosts
+            if data['screenshot']:
+                data['screenshot'] = workspace.publish(
+                    data['screenshot'], artifacts_dir, f"job-{job['id']}.png")
+
+        # A chave garante um único job de relatório mesmo se o scraping for refeito
+        report_job = queue.enqueue('report', data, job_key=f"report:{job['id']}")
+        return {'report_job': report_job}
+
+    def handle_report(job):
+        data = job['payload']
+        base_name = f"relatorio-{data['timestamp']}-job{job['id']}"
 
-        # 3. Adicionar conteudo no relatorio
-        quote = "R$ " + string_to_float_to_string(quote)
-        report_content(office, report_path, quote, today, hour, url, screenshot, author)
+        # Monta na pasta de trabalho e publica com rename: uma nova tentativa
+        # do mesmo job sobrescreve os próprios arquivos, sem duplicar relatórios
+        with Workspace() as workspace:
+            outputs = build_report(config, data, workspace.path, base_name)
 
-        # 4. Transforme em um PDF
-        office.convert_docx_to_pdf(report_path)
+            # Um formato faltando devolve o job para a fila (nova tentativa)
+            missing = set(get_formats(config)) - set(outputs)
+            if missing:
+                raise RuntimeError(f'Falha ao gerar o relatório em: {", ".join(sorted(missing))}')
 
+            published = workspace.publish_all(outputs, 'reports')
+
+        # O screenshot compartilhado só serve a este job: remove após publicar
+        screenshot = data.get('screenshot')
+        if screenshot and os.path.dirname(os.path.abspath(screenshot)) == os.path.abspath(artifacts_dir):
+            try:
+                os.remove(screenshot)
+            except OSError as e:
+                logging.warning(f'Não foi possível remover o artefato "{screenshot}": {e}')
+
+        return {'files': sorted(published.values())}
+
+    worker = Worker(
+        queue,
+        {'scrape': handle_scrape, 'report': handle_report},
+        worker_id=worker_id,
+        poll_interval=config.get('queue', {}).get('poll_interval', 5),
+        max_job_seconds=config.get('queue', {}).get('max_job_seconds', 1800))
+
+    try:
+        worker.run(drain=drain)
+    except KeyboardInterrupt:
+        logging.warning('Worker interrompido.')
     finally:
-        # Remover a pasta temporária no final da execução, se necessário
-        shutil.rmtree(tempdir)
+        if settings is not None:
+            settings.quit()
+
+
+def run_server(config):
+    """API HTTP: serve a cotação do cache e gera o PDF sob demanda."""
+
+    server_config = config.get('server', {})
+    # Resolvido uma vez: o serviço pode rodar sem terminal (systemd, contêiner)
+    author = get_author(config)
+    settings = Settings(config.get('browser'))
+    workspace = Workspace()
+    browser_lock = threading.Lock()
+    screenshot_dirs = []
+
+    def load_quote():
+        # O driver não é thread-safe: um scraping por vez
+        with browser_lock:
+            settings.ensure_healthy()
+            screenshot_dir = tempfile.mkdtemp(dir=workspace.path)
+            # O screenshot é sempre necessário: /report gera o PDF
+            data = scrape(settings, config['website'], screenshot_dir)
+
+            # Mantém o screenshot anterior para relatórios ainda em geração
+            screenshot_dirs.append(screenshot_dir)
+            while len(screenshot_dirs) > 2:
+                shutil.rmtree(screenshot_dirs.pop(0), ignore_errors=True)
+
+            return data
+
+    def build_pdf(data):
+        with Workspace() as report_workspace:
+            outputs = build_report(
+                config, data, report_workspace.path, "relatorio-" + report_workspace.run_id,
+                formats=['pdf'], race=server_config.get('race_converters', True), author=author)
+            if 'pdf' not in outputs:
+                raise RuntimeError('Falha ao converter o relatório para PDF.')
+            return report_workspace.publish(outputs['pdf'], 'reports')
+
+    service = QuoteService(
+        load_quote,
+        build_pdf,
+        ttl=server_config.get('ttl_seconds', 300),
+        refresh_interval=server_config.get('refresh_seconds'))
+
+    try:
+        service.serve(server_config.get('host', '127.0.0.1'), server_config.get('port', 8080))
+    finally:
+        settings.quit()
+        workspace.cleanup()
+
+
+def open_archive(config):
+    archive_config = config.get('archive', {})
+    return ReportArchive(archive_config.get('path', os.path.join('reports', 'archive')))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.archive or args.restore:
+        setup_logging()
+        config = load_config()
+        archive = open_archive(config)
+
+        if args.archive:
+            archive.archive_older_than(
+                'reports', config.get('archive', {}).get('older_than_days', 30),
+                default_target=config['website']['url'])
+        if args.restore:
+            try:
+                archive.restore(args.restore, 'reports')
+            except KeyError:
+                logging.error(f'Relatório não arquivado: {args.restore}')
+        return
+
+    if args.replay:
+        setup_logging()
+        config = load_config()
+
+        # Sem navegador e sem rede: os dados vêm da snapshot. Os relatórios
+        # recebem o nome da execução original e a substituem
+        try:
+            data = open_snapshots(config).load(args.replay)['data']
+        except FileNotFoundError:
+            logging.error(f'Snapshot não encontrada ou incompleta: {args.replay}')
+            return
+
+        # Sem screenshot na snapshot, os formatos que o usam não são refeitos
+        # (evita publicar um Word vazio por cima do relatório original)
+        formats = get_formats(config)
+        if data['screenshot'] is None:
+            skipped = [name for name in formats if needs_screenshot([name])]
+            if skipped:
+                logging.warning(
+                    f'A snapshot {args.replay} não tem screenshot. '
+                    f'Formatos ignorados: {", ".join(skipped)}')
+            formats = [name for name in formats if name not in skipped]
+            if not formats:
+                logging.error('Nenhum formato pode ser refeito a partir desta snapshot.')
+                return
+
+        with Workspace(args.replay) as workspace:
+            outputs = build_report(config, data, workspace.path, "relatorio-" + args.replay, formats)
+            workspace.publish_all(outputs, 'reports')
+        return
+
+    if args.serve:
+        config = load_config()
+        run_server(config)
+        return
+
+    if args.enqueue or args.worker:
+        setup_logging()
+        config = load_config()
+
+        if args.enqueue:
+            enqueue_targets(config)
+        if args.worker:
+            run_worker(config, args.worker_id, args.drain)
+        return
+
+    # Criar a pasta de trabalho exclusiva da execução (em RAM, se disponível)
+    with Workspace() as workspace:
+        # 0. Carrega as configuracoes e variaveis da aplicacao
+        config = load_config()
+
+        recorder = None
+        if args.record or config.get('snapshots', {}).get('record', False):
+            recorder = open_snapshots(config).recorder(workspace.run_id)
+
+        # 1. Acessar o site e extrair o valor da cotacao
+        formats = get_formats(config)
+        with Settings(config.get('browser')) as settings:
+            data = scrape(
+                settings, config['website'], workspace.path, needs_screenshot(formats), recorder)
+
+        # 2. Gerar o relatorio nos formatos configurados (Word/PDF, JSON, HTML, Markdown)
+        outputs = build_report(
+            config, data, workspace.subdir('output'), "relatorio-" + workspace.run_id, formats)
+
+        # 3. Publicar os arquivos finais na pasta reports
+        workspace.publish_all(outputs, 'reports')
 
 if __name__ == '__main__':
     main()
@@ -28,7 +28,8 @@ packages = [
     "time",
     "re",
     "docx",
-    "subprocess"
+    "subprocess",
+    "psutil"
 ]
 
 # Inclua os arquivos e diretórios necessários
@@ -40,7 +41,7 @@ include_files = [
 ]
 
 # Inclua os arquivos do pacote "requirements.txt"
-requirements = ["python-docx==1.1.2", "selenium==4.23.1", "cx_Freeze==7.2.0"]
+requirements = ["python-docx==1.1.2", "selenium==4.23.1", "psutil==6.0.0", "cx_Freeze==7.2.0"]
 
 # Crie o arquivo de configuração para o cx_Freeze
 build_exe_options = {
@@ -0,0 +1,350 @@
+# title: 'module archive'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import zipfile
+import zlib
+
+
+# Nome dos relatórios: relatorio-AAAAMMDD-HHMMSS[-sufixo].ext
+REPORT_NAME = re.compile(r'^relatorio-(\d{8}-\d{6})(?:-[\w-]+)?\.\w+$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReportArchive:
+    """
+    Arquivo compactado e deduplicado dos relatórios antigos.
+
+    - Cada conteúdo é gravado uma única vez em 'objects/', comprimido com
+      zlib e nomeado pelo seu SHA-256.
+    - Arquivos .docx (zip) são guardados membro a membro, então o mesmo
+      screenshot usado no .docx e no .png é armazenado só uma vez.
+    - Um índice SQLite relaciona o nome, o alvo (URL) e a data de cada
+      relatório aos seus objetos, permitindo restaurar ou ler um relatório
+      sem descompactar os demais.
+
+    Uso:
+
+        archive = ReportArchive('reports/archive')
+        archive.archive_older_than('reports', days=30)
+        archive.restore('relatorio-20240814-101500.pdf', 'reports')
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Pasta do arquivo (objetos e índice).
+        """
+
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.index_path = os.path.join(root, 'index.sqlite3')
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._create_tables()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_tables(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS entries (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL UNIQUE,
+                        target TEXT,
+                        timestamp TEXT,
+                        format TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        archived_at REAL NOT NULL)''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS members (
+                        entry_id INTEGER NOT NULL REFERENCES entries (id),
+                        position INTEGER NOT NULL,
+                        name TEXT,
+                        object TEXT NOT NULL,
+                        compress_type INTEGER,
+                        date_time TEXT,
+                        PRIMARY KEY (entry_id, position))''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_target ON entries (target, timestamp)')
+        finally:
+            conn.close()
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + '.z')
+
+    def _put_object(self, content):
+        """
+        Grava o conteúdo no repositório de objetos, se ainda não existir.
+
+        Returns:
+            str: O SHA-256 do conteúdo.
+        """
+
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as file:
+                file.write(zlib.compress(content, 9))
+            os.replace(temp_path, path)
+
+        return digest
+
+    def _read_object(self, digest):
+        """Lê o objeto em blocos descompactados."""
+
+        decompressor = zlib.decompressobj()
+        with open(self._object_path(digest), 'rb') as file:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk)
+        yield decompressor.flush()
+
+    def add(self, path, target=None, timestamp=None):
+        """
+        Adiciona um arquivo ao arquivo. Um nome já arquivado com o mesmo
+        conteúdo é ignorado; com conteúdo diferente (ex.: relatório refeito
+        pelo --replay), a entrada é substituída pela versão nova.
+
+        Args:
+            path (str): Caminho do relatório.
+            target (str, optional): URL do site consultado.
+            timestamp (str, optional): Data do relatório (AAAAMMDD-HHMMSS).
+        Returns:
+            bool: True se o conteúdo do arquivo está no arquivo.
+        """
+
+        name = os.path.basename(path)
+        file_format = os.path.splitext(name)[1].lstrip('.').lower()
+
+        if timestamp is None:
+            match = REPORT_NAME.match(name)
+            timestamp = match.group(1) if match else None
+
+        members = []
+        if zipfile.is_zipfile(path):
+            # .docx: cada membro é um objeto (imagens repetidas viram o mesmo objeto)
+            with zipfile.ZipFile(path) as package:
+                for position, info in enumerate(package.infolist()):
+                    digest = self._put_object(package.read(info))
+                    members.append((
+                        position, info.filename, digest, info.compress_type,
+                        json.dumps(info.date_time)))
+        else:
+            with open(path, 'rb') as file:
+                digest = self._put_object(file.read())
+            members.append((0, None, digest, None, None))
+
+        size = os.path.getsize(path)
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    'SELECT id, size FROM entries WHERE name = ?', (name,)).fetchone()
+
+                if row is not None:
+                    archived = conn.execute(
+                        'SELECT position, name, object, compress_type, date_time FROM members '
+                        'WHERE entry_id = ? ORDER BY position', (row['id'],)).fetchall()
+                    if row['size'] == size and [tuple(member) for member in archived] == members:
+                        logging.debug(f'"{name}" já está arquivado.')
+                        return True
+
+                    # Mesmo nome, conteúdo novo: substitui a entrada numa única transação
+                    logging.info(f'"{name}" já estava arquivado com outro conteúdo. Substituindo.')
+                    conn.execute('DELETE FROM members WHERE entry_id = ?', (row['id'],))
+                    conn.execute('DELETE FROM entries WHERE id = ?', (row['id'],))
+
+                cursor = conn.execute(
+                    'INSERT INTO entries (name, target, timestamp, format, size, archived_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (name, target, timestamp, file_format, size, time.time()))
+                conn.executemany(
+                    'INSERT INTO members (entry_id, position, name, object, compress_type, date_time) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(cursor.lastrowid,) + member for member in members])
+
+        finally:
+            conn.close()
+
+        return True
+
+    def archive_older_than(self, report_dir, days, default_target=None):
+        """
+        Move para o arquivo os relatórios com mais de 'days' dias.
+
+        O alvo de cada relatório é lido do .json da mesma execução, quando
+        existir; caso contrário, é usado default_target.
+
+        Returns:
+            int: Quantidade de arquivos arquivados.
+        """
+
+        if not os.path.isdir(report_dir):
+            logging.info(f'Pasta "{report_dir}" não encontrada. Nada a arquivar.')
+            return 0
+
+        limit = datetime.datetime.now() - datetime.timedelta(days=days)
+        groups = {}
+
+        for name in sorted(os.listdir(report_dir)):
+            path = os.path.join(report_dir, name)
+            match = REPORT_NAME.match(name)
+            if not match or not os.path.isfile(path):
+                continue
+
+            timestamp = datetime.datetime.strptime(match.group(1), '%Y%m%d-%H%M%S')
+            if timestamp < limit:
+                groups.setdefault(os.path.splitext(name)[0], []).append(path)
+
+        archived = 0
+        for base_name, paths in groups.items():
+            target = _read_target(os.path.join(report_dir, base_name + '.json')) or default_target
+
+            for path in paths:
+                try:
+                    self.add(path, target)
+                    os.remove(path)
+                    archived += 1
+                except Exception as e:
+                    logging.error(f'Erro ao arquivar "{path}": {e}')
+
+        logging.info(f'{archived} arquivo(s) movido(s) para o arquivo em: {self.root}')
+        return archived
+
+    def find(self, target=None, since=None, until=None, name=None):
+        """
+        Busca relatórios no índice.
+
+        Args:
+            target (str, optional): URL do site consultado.
+            since (str, optional): Data inicial (AAAAMMDD-HHMMSS), inclusiva.
+            until (str, optional): Data final (AAAAMMDD-HHMMSS), inclusiva.
+            name (str, optional): Nome exato do arquivo.
+        Returns:
+            list: Dicts com name, target, timestamp, format e size.
+        """
+
+        clauses, params = [], []
+        for column, operator, value in (
+                ('target', '=', target), ('timestamp', '>=', since),
+                ('timestamp', '<=', until), ('name', '=', name)):
+            if value is not None:
+                clauses.append(f'{column} {operator} ?')
+                params.append(value)
+
+        query = 'SELECT name, target, timestamp, format, size FROM entries'
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY timestamp, name'
+
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def _members(self, name):
+        conn = self._connect()
+        try:
+            return conn.execute(
+                'SELECT m.* FROM members m JOIN entries e ON e.id = m.entry_id '
+                'WHERE e.name = ? ORDER BY m.position', (name,)).fetchall()
+        finally:
+            conn.close()
+
+    def stream(self, name):
+        """
+        Lê um relatório arquivado em blocos, sem gravá-lo em disco.
+
+        Raises:
+            KeyError: Se o relatório não estiver no arquivo.
+        """
+
+        members = self._members(name)
+        if not members:
+            raise KeyError(f'Relatório não arquivado: {name}')
+
+        if members[0]['name'] is None:
+            yield from self._read_object(members[0]['object'])
+            return
+
+        # .docx: remonta o zip num arquivo temporário em memória/disco
+        with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as buffer:
+            self._write_package(members, buffer)
+            buffer.seek(0)
+            while True:
+                chunk = buffer.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _write_package(self, members, file):
+        with zipfile.ZipFile(file, 'w') as package:
+            for member in members:
+                info = zipfile.ZipInfo(member['name'], tuple(json.loads(member['date_time'])))
+                info.compress_type = member['compress_type']
+                package.writestr(info, b''.join(self._read_object(member['object'])))
+
+    def restore(self, name, dest_dir):
+        """
+        Restaura um relatório arquivado.
+
+        Returns:
+            str: O caminho do arquivo restaurado.
+        Raises:
+            KeyError: Se o relatório não estiver no arquivo.
+        """
+
+        # Confere o índice antes de criar qualquer arquivo no destino
+        if not self._members(name):
+            raise KeyError(f'Relatório não arquivado: {name}')
+
+        os.makedirs(dest_dir, exist_ok=True)
+        path = os.path.join(dest_dir, name)
+        temp_path = path + '.tmp'
+
+        try:
+            with open(temp_path, 'wb') as file:
+                for chunk in self.stream(name):
+                    file.write(chunk)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        logging.info(f'Relatório restaurado em: {path}')
+        return path
+
+
+def _read_target(json_path):
+    """Lê a URL do relatório .json da execução, se existir."""
+
+    try:
+        with open(json_path, 'r', encoding='utf8') as file:
+            return json.load(file).get('url')
+    except (OSError, ValueError):
+        return None
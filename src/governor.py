@@ -0,0 +1,243 @@
+# title: 'module governor'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import glob
+import json
+import logging
+import os
+import psutil
+
+
+class ResourceGovernor:
+    """
+    Acompanha a árvore de processos do navegador (chromedriver e Chrome).
+
+    - Mede o uso de memória (RSS) e a quantidade de processos filhos.
+    - Registra os processos num arquivo por execução, para que os processos
+      órfãos de execuções anteriores (que morreram sem fechar o navegador)
+      sejam finalizados na próxima inicialização.
+
+    Uso:
+
+        governor = ResourceGovernor(log_dir, max_rss_mb=1500, max_children=40)
+        governor.kill_orphans()
+        governor.register(driver)
+
+        if governor.over_limits():
+            ...  # reiniciar o navegador
+    """
+
+    def __init__(self, state_dir, max_rss_mb=1500, max_children=40):
+        """
+        Args:
+            state_dir (str): Pasta onde ficam os arquivos de registro dos processos.
+            max_rss_mb (float): Memória máxima da árvore do navegador, em MB.
+            max_children (int): Quantidade máxima de processos filhos.
+        """
+
+        self.state_dir = state_dir
+        self.max_rss_mb = max_rss_mb
+        self.max_children = max_children
+        self.root_pid = None
+        self.root_create_time = None
+        self.state_file = os.path.join(state_dir, f'browser-{os.getpid()}.json')
+
+    def register(self, driver):
+        """Passa a acompanhar a árvore de processos do driver informado."""
+
+        try:
+            self.root_pid = driver.service.process.pid
+            self.root_create_time = psutil.Process(self.root_pid).create_time()
+        except (AttributeError, psutil.Error):
+            logging.warning('Não foi possível obter o processo do driver.')
+            self.root_pid = None
+            return
+
+        self._save_state()
+
+    def _tree(self):
+        """Retorna o processo do driver e todos os seus descendentes."""
+
+        if self.root_pid is None:
+            return []
+
+        try:
+            root = psutil.Process(self.root_pid)
+            # Se o driver já terminou, o PID pode ter sido reutilizado por outro processo
+            if root.create_time() != self.root_create_time:
+                return []
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def snapshot(self):
+        """
+        Retorna os processos da árvore atual com a hora de criação de cada um.
+        Deve ser chamado antes de driver.quit(): depois disso o chromedriver já
+        terminou e a árvore não pode mais ser percorrida.
+
+        Returns:
+            list: Dicts com 'pid' e 'create_time'.
+        """
+
+        processes = []
+        for process in self._tree():
+            try:
+                processes.append({'pid': process.pid, 'create_time': process.create_time()})
+            except psutil.Error:
+                continue
+
+        return processes
+
+    def _save_state(self):
+        """Grava os processos da árvore atual no arquivo desta execução."""
+
+        processes = self.snapshot()
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        state = {
+            'owner_pid': os.getpid(),
+            'owner_create_time': psutil.Process().create_time(),
+            'processes': processes,
+        }
+        with open(self.state_file, 'w', encoding='utf8') as file:
+            json.dump(state, file)
+
+    def usage(self):
+        """
+        Returns:
+            tuple: (RSS total em MB, quantidade de processos filhos).
+        """
+
+        tree = self._tree()
+        rss = 0
+        for process in tree:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                continue
+
+        return rss / (1024 * 1024), max(len(tree) - 1, 0)
+
+    def over_limits(self):
+        """
+        Verifica se o navegador passou dos limites de memória ou de processos.
+        Também atualiza o registro, já que o Chrome cria processos sob demanda.
+
+        Returns:
+            bool: True se o navegador deve ser reiniciado.
+        """
+
+        rss_mb, children = self.usage()
+        self._save_state()
+        logging.debug(f'Navegador: {rss_mb:.0f} MB, {children} processos filhos.')
+
+        if rss_mb > self.max_rss_mb or children > self.max_children:
+            logging.warning(
+                f'Navegador acima dos limites ({rss_mb:.0f} MB de {self.max_rss_mb} MB, '
+                f'{children} de {self.max_children} processos).')
+            return True
+
+        return False
+
+    def kill_processes(self, processes):
+        """
+        Finaliza os processos de um snapshot que ainda estiverem vivos. Um
+        processo só é finalizado se a hora de criação for a mesma registrada,
+        para não atingir um PID reutilizado.
+
+        Returns:
+            int: Quantidade de processos finalizados.
+        """
+
+        alive = []
+        for entry in processes:
+            try:
+                process = psutil.Process(entry['pid'])
+                if process.create_time() == entry['create_time']:
+                    alive.append(process)
+            except psutil.Error:
+                continue
+
+        return self._kill(alive)
+
+    def unregister(self):
+        """Encerra o acompanhamento e remove o arquivo desta execução."""
+
+        self.root_pid = None
+        self.root_create_time = None
+        try:
+            os.remove(self.state_file)
+        except FileNotFoundError:
+            pass
+
+    def kill_orphans(self):
+        """
+        Finaliza os processos registrados por execuções anteriores cujo
+        processo dono não existe mais.
+
+        Returns:
+            int: Quantidade de processos finalizados.
+        """
+
+        killed = 0
+
+        for state_file in glob.glob(os.path.join(self.state_dir, 'browser-*.json')):
+            try:
+                with open(state_file, 'r', encoding='utf8') as file:
+                    state = json.load(file)
+            except (OSError, ValueError):
+                continue
+
+            if _is_alive(state.get('owner_pid'), state.get('owner_create_time')):
+                continue
+
+            # Reserva o arquivo com rename atômico: se outra execução iniciando
+            # ao mesmo tempo já o reservou, ela cuida dos órfãos
+            claimed = f'{state_file}.{os.getpid()}.claim'
+            try:
+                os.rename(state_file, claimed)
+            except FileNotFoundError:
+                continue
+
+            killed += self.kill_processes(state.get('processes', []))
+
+            try:
+                os.remove(claimed)
+            except FileNotFoundError:
+                pass
+
+        if killed:
+            logging.warning(f'{killed} processo(s) órfão(s) do navegador finalizado(s).')
+
+        return killed
+
+    def _kill(self, processes):
+        """Finaliza os processos informados e aguarda o encerramento."""
+
+        alive = []
+        for process in processes:
+            try:
+                process.kill()
+                alive.append(process)
+            except psutil.Error:
+                continue
+
+        psutil.wait_procs(alive, timeout=5)
+        return len(alive)
+
+
+def _is_alive(pid, create_time):
+    """Verifica se o processo existe e é o mesmo que foi registrado."""
+
+    if pid is None:
+        return False
+
+    try:
+        return psutil.Process(pid).create_time() == create_time
+    except psutil.Error:
+        return False
@@ -0,0 +1,251 @@
+# title: 'module jobqueue'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import json
+import logging
+import os
+import sqlite3
+import time
+
+
+class JobQueue:
+    """
+    Fila de jobs persistida em SQLite, compartilhada entre o produtor e os
+    workers. A exclusividade da reserva depende do lock do SQLite: entre
+    hosts, a pasta da fila precisa estar num sistema de arquivos com locks
+    POSIX confiáveis (NFS e SMB não servem).
+
+    Cada job é reservado por um worker através de um lease com prazo. Se o
+    worker travar ou morrer, o lease expira e o job volta para a fila
+    automaticamente na próxima reserva.
+
+    Métodos:
+    - enqueue(kind, payload, job_key=None): Enfileira um job (idempotente por job_key).
+    - claim(worker_id): Reserva o próximo job pendente.
+    - heartbeat(job_id, worker_id): Renova o lease de um job em execução.
+    - complete(job_id, worker_id, result): Grava o resultado do job.
+    - fail(job_id, worker_id, error): Devolve o job para a fila ou marca como falho.
+    - stats(): Quantidade de jobs por status.
+    """
+
+    def __init__(self, db_path, lease_seconds=300, max_attempts=3):
+        """
+        Args:
+            db_path (str): Caminho do arquivo SQLite da fila.
+            lease_seconds (int): Duração do lease de cada reserva.
+            max_attempts (int): Tentativas antes de marcar o job como falho.
+        """
+
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._create_tables()
+
+    def _connect(self):
+        """Abre uma conexão em modo autocommit (transações explícitas)."""
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_tables(self):
+        """Cria a tabela de jobs, caso não exista."""
+
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    job_key TEXT UNIQUE,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL)''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_jobs_status
+                ON jobs (status, lease_expires)''')
+        finally:
+            conn.close()
+
+    def enqueue(self, kind, payload, job_key=None):
+        """
+        Enfileira um job. Se job_key já existir, o job existente é mantido.
+
+        Args:
+            kind (str): Tipo do job ('scrape', 'report', ...).
+            payload (dict): Dados do job, serializáveis em JSON.
+            job_key (str, optional): Chave de idempotência do job.
+        Returns:
+            int: O id do job (novo ou já existente).
+        """
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO jobs (kind, job_key, payload, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (kind, job_key, json.dumps(payload), now, now))
+
+            if cursor.rowcount == 1:
+                logging.info(f'Job {cursor.lastrowid} ({kind}) enfileirado.')
+                return cursor.lastrowid
+
+            row = conn.execute(
+                'SELECT id FROM jobs WHERE job_key = ?', (job_key,)).fetchone()
+            logging.debug(f'Job "{job_key}" já estava na fila (id {row["id"]}).')
+            return row['id']
+        finally:
+            conn.close()
+
+    def claim(self, worker_id):
+        """
+        Reserva o próximo job pendente para o worker, recuperando antes os
+        jobs cujo lease expirou.
+
+        Args:
+            worker_id (str): Identificador único do worker.
+        Returns:
+            dict: O job reservado (id, kind, payload, attempts), ou None se a fila estiver vazia.
+        """
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            self._reclaim_expired(conn, now)
+
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row['id']))
+            conn.execute('COMMIT')
+
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'payload': json.loads(row['payload']),
+            'attempts': row['attempts'] + 1,
+        }
+
+    def _reclaim_expired(self, conn, now):
+        """Devolve para a fila os jobs com lease expirado (worker travado ou morto)."""
+
+        cursor = conn.execute(
+            "UPDATE jobs SET "
+            "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = 'lease expirado (' || lease_owner || ')', "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = 'running' AND lease_expires < ?",
+            (self.max_attempts, now, now))
+
+        if cursor.rowcount:
+            logging.warning(f'{cursor.rowcount} job(s) com lease expirado recuperado(s).')
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Renova o lease de um job em execução.
+
+        Returns:
+            bool: False se o worker perdeu o lease do job.
+        """
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job_id, worker_id, result=None):
+        """
+        Grava o resultado do job. Só o dono atual do lease consegue concluir,
+        então uma conclusão repetida ou tardia é descartada.
+
+        Returns:
+            bool: True se o resultado foi gravado.
+        """
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (json.dumps(result), time.time(), job_id, worker_id))
+        finally:
+            conn.close()
+
+        if cursor.rowcount != 1:
+            logging.warning(f'Lease do job {job_id} perdido. Resultado descartado.')
+            return False
+
+        logging.info(f'Job {job_id} concluído.')
+        return True
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Registra a falha do job, devolvendo-o para a fila enquanto houver
+        tentativas restantes.
+
+        Returns:
+            bool: True se a falha foi registrada.
+        """
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (self.max_attempts, str(error), time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Quantidade de jobs por status.
+        """
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT status, COUNT(*) AS total FROM jobs GROUP BY status').fetchall()
+            return {row['status']: row['total'] for row in rows}
+        finally:
+            conn.close()
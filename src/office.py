@@ -1,8 +1,8 @@
 # title: 'module office'
 # author: 'Elias Albuquerque'
-# version: '0.3.0'
+# version: '0.4.0'
 # created: '2024-08-09'
-# update: '2024-08-13'
+# update: '2026-10-19'
 
 
 import logging
@@ -10,12 +10,23 @@ import docx
 import re
 import os
 import shutil
+import sqlite3
 import subprocess
+import tempfile
+import time
 import urllib.request
+import psutil
+from time import sleep
 from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
 from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.table import Table
+
+
+# Caracteres que não podem aparecer no XML do documento (controles, exceto tab e quebra de linha)
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b-\x1f\ud800-\udfff\ufffe\uffff]')
 
 
 class Office:
@@ -27,10 +38,30 @@ class Office:
     - create_document(file_name, file_path): Cria um novo arquivo.
     - convert_docx_to_pdf(docx_path): Converte um arquivo .docx para .pdf.
     - add_hyperlink(paragraph, url, text, color="0000FF", underline=True): Adicionar hiperlink em um elemento contido em um parágrafo
+    - add_runs(paragraph, runs): Adiciona vários trechos de texto formatados de uma vez
+    - add_table(doc, rows, header=None): Adiciona uma tabela gerando o XML em bloco
     """
 
-    def __init__(self):
+    # Conversores suportados e o nome usado nos logs
+    CONVERTERS = {
+        'word': 'Word',
+        'libreoffice': 'LibreOffice',
+        'pandoc': 'Pandoc',
+    }
+
+    def __init__(self, timeout=120, race=False, stats_path=None):
+        """
+        Args:
+            timeout (float): Tempo limite, em segundos, de cada conversão para PDF.
+            race (bool): Se True, converte com os dois conversores mais rápidos em paralelo.
+            stats_path (str, optional): Arquivo do histórico dos conversores. Padrão 'log/converters.sqlite3'.
+        """
+
         self.doc = None
+        self.timeout = timeout
+        self.race = race
+        self.stats = ConverterStats(stats_path or os.path.join('log', 'converters.sqlite3'))
+        self._executables = {}
 
     def create_document(self, file_name, file_path):
         """Cria um novo documento com um nome e caminho definido.
@@ -64,6 +95,12 @@ class Office:
         Converte um arquivo .docx para .pdf utilizando Word, LibreOffice ou Pandoc,
         conforme a disponibilidade das ferramentas.
 
+        As ferramentas são tentadas da mais rápida para a mais lenta, segundo
+        o histórico de latência e falhas (ConverterStats). Cada tentativa tem
+        um timeout e só é aceita se o código de saída for zero e o PDF gerado
+        for válido. Com race=True, as duas primeiras ferramentas disponíveis
+        convertem em paralelo e o primeiro PDF válido é mantido.
+
         Parâmetros:
         - docx_path (str): Caminho completo para o arquivo .docx que deve ser convertido.
 
@@ -71,35 +108,183 @@ class Office:
         - bool: True se a conversão foi bem-sucedida, False se falhar em todas as tentativas.
         """
 
-        program_files_path = os.environ.get('ProgramFiles', 'C:\\Program Files')
-
-        try:
-            exec_word = self._check_word_installed(program_files_path)
-            if exec_word:
-                self._convert_with_word(docx_path, exec_word)
+        pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
+        backends = self.stats.rank(list(self.CONVERTERS))
+        logging.debug(f'Ordem dos conversores: {backends}')
+
+        if self.race:
+            available = []
+            for name in backends:
+                executable = self._find_converter(name)
+                if executable:
+                    available.append((name, executable))
+                if len(available) == 2:
+                    break
+
+            if len(available) == 2:
+                if self._race_converters(available, docx_path, pdf_path):
+                    return True
+                backends = [name for name in backends if name not in dict(available)]
+
+        for name in backends:
+            executable = self._find_converter(name)
+            if executable and self._run_converter(name, executable, docx_path, pdf_path):
                 return True
-        except PermissionError:
-            logging.error("Permissão negada para acessar o Microsoft Word.")
-        except Exception as e:
-            logging.error(f"Erro ao converter com Word: {e}")
+
+        logging.error(f'Não foi possível converter "{docx_path}" para PDF.')
+        return False
+
+    def _find_converter(self, name):
+        """
+        Retorna o executável do conversor, ou None se não estiver instalado.
+        O resultado fica em cache na instância.
+        """
+
+        if name not in self._executables:
+            program_files_path = os.environ.get('ProgramFiles', 'C:\\Program Files')
+            try:
+                if name == 'word':
+                    executable = self._check_word_installed(program_files_path)
+                elif name == 'libreoffice':
+                    executable = self._check_libreoffice_installed(program_files_path)
+                else:
+                    executable = self._check_pandoc_installed()
+            except PermissionError:
+                logging.error(f"Permissão negada para acessar o {self.CONVERTERS[name]}.")
+                executable = None
+            except Exception as e:
+                logging.error(f"Erro ao procurar o {self.CONVERTERS[name]}: {e}")
+                executable = None
+            self._executables[name] = executable
+
+        return self._executables[name]
+
+    def _converter_command(self, name, executable, docx_path, outdir):
+        """
+        Monta o comando de conversão, gravando o PDF em outdir.
+
+        Retorna:
+        - tuple: (comando, caminho do PDF que o comando gera).
+        """
+
+        pdf_file = os.path.splitext(os.path.basename(docx_path))[0] + '.pdf'
+        pdf_path = os.path.join(outdir, pdf_file)
+
+        if name == 'word':
+            return [executable, docx_path, '/t', pdf_path, '/q'], pdf_path
+        if name == 'libreoffice':
+            # Perfil próprio por tentativa: com o perfil padrão em uso por outro
+            # soffice, a conversão termina com sucesso sem gerar o arquivo
+            profile = Path(outdir, 'lo-profile').resolve().as_uri()
+            return [
+                executable, f'-env:UserInstallation={profile}', '--headless',
+                '--convert-to', 'pdf', '--outdir', outdir, docx_path], pdf_path
+        return [executable, docx_path, '-o', pdf_path], pdf_path
+
+    def _run_converter(self, name, executable, docx_path, pdf_path):
+        """
+        Executa um conversor com timeout, valida o PDF e registra o resultado.
+
+        Retorna:
+        - bool: True se o PDF foi gerado e é válido.
+        """
+
+        outdir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(pdf_path)))
+        command, output = self._converter_command(name, executable, os.path.abspath(docx_path), outdir)
+        start = time.monotonic()
 
         try:
-            exec_libreoffice = self._check_libreoffice_installed(program_files_path)
-            if exec_libreoffice:
-                self._convert_with_libreoffice(docx_path, exec_libreoffice)
-                return True
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                returncode = process.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                # Finaliza também os processos filhos (ex.: soffice.bin)
+                _kill_process_tree(process)
+                raise
+
+            if returncode != 0:
+                raise RuntimeError(f'código de saída {returncode}')
+            if not is_valid_pdf(output):
+                raise RuntimeError('PDF inválido ou não gerado')
+
+            os.replace(output, pdf_path)
+
+        except subprocess.TimeoutExpired:
+            logging.error(f'{self.CONVERTERS[name]} excedeu o tempo limite de {self.timeout}s.')
+            self.stats.record(name, False, time.monotonic() - start)
+            return False
         except Exception as e:
-            logging.error(f"Erro ao converter com LibreOffice: {e}")
-        
+            logging.error(f"Erro ao converter com {self.CONVERTERS[name]}: {e}")
+            self.stats.record(name, False, time.monotonic() - start)
+            return False
+        finally:
+            shutil.rmtree(outdir, ignore_errors=True)
+
+        self.stats.record(name, True, time.monotonic() - start)
+        logging.info(f'Arquivo convertido para PDF com {self.CONVERTERS[name]}: {pdf_path}')
+        return True
+
+    def _race_converters(self, candidates, docx_path, pdf_path):
+        """
+        Executa dois conversores em paralelo, mantém o primeiro PDF válido e
+        finaliza o outro.
+
+        Parâmetros:
+        - candidates (list): Lista de tuplas (nome, executável).
+
+        Retorna:
+        - bool: True se algum conversor gerou um PDF válido.
+        """
+
+        logging.info(f'Convertendo em paralelo com: {", ".join(name for name, _ in candidates)}')
+
+        running = {}
+        start = time.monotonic()
+        outdirs = []
         try:
-            exec_pandoc = self._check_pandoc_installed()
-            if exec_pandoc:
-                self._convert_with_pandoc(docx_path, exec_pandoc)
-                return True
-        except Exception as e:
-            logging.error(f"Erro ao converter com Pandoc: {e}")
+            for name, executable in candidates:
+                outdir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(pdf_path)))
+                outdirs.append(outdir)
+                command, output = self._converter_command(name, executable, os.path.abspath(docx_path), outdir)
+                try:
+                    process = subprocess.Popen(
+                        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                except OSError as e:
+                    logging.error(f"Erro ao converter com {self.CONVERTERS[name]}: {e}")
+                    self.stats.record(name, False, 0)
+                    continue
+                running[name] = (process, output)
+
+            while running and time.monotonic() - start < self.timeout:
+                for name, (process, output) in list(running.items()):
+                    if process.poll() is None:
+                        continue
+
+                    del running[name]
+                    elapsed = time.monotonic() - start
+
+                    if process.returncode == 0 and is_valid_pdf(output):
+                        os.replace(output, pdf_path)
+                        self.stats.record(name, True, elapsed)
+                        logging.info(f'Arquivo convertido para PDF com {self.CONVERTERS[name]}: {pdf_path}')
+                        return True
+
+                    logging.error(f'{self.CONVERTERS[name]} falhou (código {process.returncode}).')
+                    self.stats.record(name, False, elapsed)
+
+                sleep(0.1)
+
+            for name in running:
+                logging.error(f'{self.CONVERTERS[name]} excedeu o tempo limite de {self.timeout}s.')
+                self.stats.record(name, False, time.monotonic() - start)
+            return False
 
-        return False
+        finally:
+            # Os perdedores são finalizados sem contar como falha
+            for process, _ in running.values():
+                _kill_process_tree(process)
+            for outdir in outdirs:
+                shutil.rmtree(outdir, ignore_errors=True)
 
     def _check_word_installed(self, program_files_path):
         """
@@ -143,7 +328,8 @@ class Office:
             if 'soffice.exe' in files:
                 return os.path.join(root, 'soffice.exe')
 
-        return None
+        # Linux/macOS: LibreOffice no PATH
+        return shutil.which('soffice') or shutil.which('libreoffice')
 
     def _check_pandoc_installed(self):
         """
@@ -185,51 +371,6 @@ class Office:
 
         return None
 
-    def _convert_with_word(self, docx_path, exec_word):
-        """
-        Converte um arquivo .docx para .pdf usando o Microsoft Word.
-
-        Parâmetros:
-        - docx_path (str): Caminho completo para o arquivo .docx.
-        - exec_word (str): Caminho completo para o executável do Microsoft Word.
-
-        Retorna:
-        - None
-        """
-        pdf_path = docx_path.replace('.docx', '.pdf')
-        subprocess.run([exec_word, docx_path, '/t', pdf_path, '/q'])
-        logging.info(f'Arquivo convertido para PDF: {pdf_path}')
-
-    def _convert_with_libreoffice(self, docx_path, exec_libreoffice):
-        """
-        Converte um arquivo .docx para .pdf usando o LibreOffice.
-
-        Parâmetros:
-        - docx_path (str): Caminho completo para o arquivo .docx.
-        - exec_libreoffice (str): Caminho completo para o executável do LibreOffice.
-
-        Retorna:
-        - None
-        """
-        pdf_path = docx_path.replace('.docx', '.pdf')
-        subprocess.run([exec_libreoffice, '--headless', '--convert-to', 'pdf', '--outdir', os.path.dirname(docx_path), docx_path])
-        logging.info(f'Arquivo convertido para PDF: {pdf_path}')
-
-    def _convert_with_pandoc(self, docx_path, exec_pandoc):
-        """
-        Converte um arquivo .docx para .pdf usando o Pandoc.
-
-        Parâmetros:
-        - docx_file (str): Caminho completo para o arquivo .docx.
-
-        Retorna:
-        - None
-        """
-        pdf_path = docx_path.replace('.docx', '.pdf')
-        subprocess.run([exec_pandoc, docx_path, '-o', pdf_path])
-        logging.info(f'Arquivo convertido para PDF: {pdf_path}')
-
-
     def add_hyperlink(self, paragraph, url, text, color="0000FF", underline=True):
         """
         Adiciona um hyperlink a um parágrafo.
@@ -249,39 +390,270 @@ class Office:
         part = paragraph.part
         r_id = part.relate_to(url, qn('r:hyperlink'), is_external=True)
 
-        # Cria o elemento hyperlink
-        hyperlink = OxmlElement('w:hyperlink')
-        hyperlink.set(qn('r:id'), r_id)
+        # Monta o hyperlink com o run formatado num único fragmento XML
+        hyperlink = parse_xml(
+            f'<w:hyperlink {nsdecls("w", "r")} r:id={quoteattr(r_id)}>'
+            f'{self.build_run_xml(text, color=color, underline=underline)}'
+            '</w:hyperlink>')
+
+        # Adiciona o hyperlink ao parágrafo
+        paragraph._element.append(hyperlink)
 
-        # Cria um novo elemento run para o texto do hyperlink
-        new_run = OxmlElement('w:r')
-        rPr = OxmlElement('w:rPr')
+        return paragraph
 
-        # Adiciona cor e sublinhado ao hyperlink
-        color_element = OxmlElement('w:color')
-        color_element.set(qn('w:val'), color)
-        rPr.append(color_element)
+    def build_run_xml(self, text, bold=False, italic=False, color=None, size=None, underline=False):
+        """
+        Gera o XML de um run (trecho de texto formatado), sem declarar namespaces.
+
+        :param text: O texto do run.
+        :param bold: Negrito.
+        :param italic: Itálico.
+        :param color: A cor do texto como string hexadecimal (sem o '#').
+        :param size: O tamanho da fonte em pontos.
+        :param underline: Sublinhado simples.
+        :return: O fragmento XML '<w:r>...</w:r>'.
+        """
 
+        properties = ''
+        if bold:
+            properties += '<w:b/>'
+        if italic:
+            properties += '<w:i/>'
+        if color:
+            properties += f'<w:color w:val={quoteattr(color)}/>'
+        if size:
+            # O Word guarda o tamanho em meios pontos
+            properties += f'<w:sz w:val="{int(size * 2)}"/>'
         if underline:
-            underline_element = OxmlElement('w:u')
-            underline_element.set(qn('w:val'), 'single')
-            rPr.append(underline_element)
+            properties += '<w:u w:val="single"/>'
+        if properties:
+            properties = f'<w:rPr>{properties}</w:rPr>'
 
-        new_run.append(rPr)
+        text = INVALID_XML_CHARS.sub('', str(text))
+        return f'<w:r>{properties}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
 
-        # Adiciona o texto do hyperlink
-        text_element = OxmlElement('w:t')
-        text_element.text = text
-        new_run.append(text_element)
+    def add_runs(self, paragraph, runs):
+        """
+        Adiciona vários runs formatados a um parágrafo de uma só vez.
 
-        # Adiciona o run ao hyperlink
-        hyperlink.append(new_run)
+        :param paragraph: O parágrafo de destino.
+        :param runs: Lista de dicts com os argumentos de build_run_xml (text, bold, color, ...).
+        :return: O parágrafo.
+        """
 
-        # Adiciona o hyperlink ao parágrafo
-        paragraph._element.append(hyperlink)
+        fragment = parse_xml(
+            f'<w:p {nsdecls("w")}>'
+            + ''.join(self.build_run_xml(**run) for run in runs)
+            + '</w:p>')
 
+        paragraph._element.extend(list(fragment))
         return paragraph
 
+    def add_table(self, doc, rows, header=None, style='Table Grid', header_color="D9D9D9"):
+        """
+        Adiciona uma tabela ao final do documento, gerando todo o XML de uma vez.
+
+        A API de células do python-docx percorre a tabela inteira a cada
+        célula acessada; aqui a tabela é montada como texto, convertida num
+        único parse e inserida no corpo do documento em um passo, o que
+        mantém o tempo linear no número de linhas.
+
+        :param doc: O documento (docx.Document).
+        :param rows: Lista de linhas, cada uma uma sequência de valores.
+        :param header: Cabeçalho opcional (repetido em cada página, em negrito).
+        :param style: Nome do estilo de tabela, se existir no documento.
+        :param header_color: Cor de fundo do cabeçalho, hexadecimal (sem o '#').
+        :return: A tabela inserida (docx.table.Table).
+        :raises ValueError: Se a tabela não tiver colunas (sem cabeçalho e sem linhas).
+        """
+
+        columns = max([len(header or ())] + [len(row) for row in rows])
+        if not columns:
+            # Uma tabela sem linhas ou colunas é um OOXML inválido (o Word acusa o arquivo corrompido)
+            raise ValueError('A tabela precisa de ao menos uma linha com uma coluna.')
+
+        properties = '<w:tblW w:w="5000" w:type="pct"/>'
+        try:
+            properties = f'<w:tblStyle w:val={quoteattr(doc.styles[style].style_id)}/>' + properties
+        except KeyError:
+            logging.debug(f'Estilo de tabela "{style}" não encontrado.')
+
+        parts = [
+            f'<w:tbl {nsdecls("w")}>',
+            f'<w:tblPr>{properties}</w:tblPr>',
+            '<w:tblGrid>' + '<w:gridCol/>' * columns + '</w:tblGrid>',
+        ]
+
+        if header:
+            cell_properties = f'<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill={quoteattr(header_color)}/></w:tcPr>'
+            parts.append('<w:tr><w:trPr><w:tblHeader/></w:trPr>')
+            parts.extend(
+                f'<w:tc>{cell_properties}<w:p>{self.build_run_xml(value, bold=True)}</w:p></w:tc>'
+                for value in header)
+            parts.append(f'<w:tc>{cell_properties}<w:p/></w:tc>' * (columns - len(header)))
+            parts.append('</w:tr>')
+
+        for row in rows:
+            parts.append('<w:tr>')
+            parts.extend(
+                f'<w:tc><w:p>{self.build_run_xml(value)}</w:p></w:tc>' for value in row)
+            # Completa as linhas curtas: toda linha precisa ter todas as colunas
+            parts.append('<w:tc><w:p/></w:tc>' * (columns - len(row)))
+            parts.append('</w:tr>')
+
+        parts.append('</w:tbl>')
+        tbl = parse_xml(''.join(parts))
+
+        # Insere antes das propriedades de seção, que devem ser o último elemento do corpo
+        body = doc.element.body
+        sectPr = body.find(qn('w:sectPr'))
+        if sectPr is not None:
+            sectPr.addprevious(tbl)
+        else:
+            body.append(tbl)
+
+        return Table(tbl, doc._body)
+
+
+class ConverterStats:
+    """
+    Histórico de sucesso e latência de cada conversor para PDF, persistido
+    em SQLite para que as próximas execuções comecem pelo conversor mais
+    rápido. Cada registro é lido e atualizado numa única transação, então
+    conversões simultâneas não perdem atualizações.
+
+    As médias são móveis exponenciais (EWMA), de modo que o histórico
+    recente pesa mais que o antigo.
+    """
+
+    ALPHA = 0.3
+    MIN_SUCCESS_RATE = 0.5
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        """Abre uma conexão em modo autocommit, criando a tabela se necessário."""
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS converters (
+                name TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL,
+                success_rate REAL NOT NULL,
+                latency REAL)''')
+        return conn
+
+    def record(self, name, success, latency):
+        """Registra o resultado de uma tentativa de conversão."""
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logging.debug(f'Não foi possível gravar o histórico dos conversores: {e}')
+            return
+
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT * FROM converters WHERE name = ?', (name,)).fetchone()
+            entry = dict(row) if row else {'attempts': 0, 'success_rate': 1.0, 'latency': None}
+
+            entry['attempts'] += 1
+            entry['success_rate'] += self.ALPHA * (float(success) - entry['success_rate'])
+            if success:
+                if entry['latency'] is None:
+                    entry['latency'] = latency
+                else:
+                    entry['latency'] += self.ALPHA * (latency - entry['latency'])
+
+            conn.execute(
+                'INSERT OR REPLACE INTO converters (name, attempts, success_rate, latency) '
+                'VALUES (?, ?, ?, ?)',
+                (name, entry['attempts'], entry['success_rate'], entry['latency']))
+            conn.execute('COMMIT')
+
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            logging.debug(f'Não foi possível gravar o histórico dos conversores: {e}')
+        finally:
+            conn.close()
+
+    def _load(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return {}
+
+        try:
+            return {row['name']: dict(row) for row in conn.execute('SELECT * FROM converters')}
+        except sqlite3.Error:
+            return {}
+        finally:
+            conn.close()
+
+    def rank(self, names):
+        """
+        Ordena os conversores: primeiro os saudáveis, do mais rápido para o
+        mais lento (sem histórico conta como o mais rápido, para ser medido),
+        depois os que vêm falhando.
+
+        Retorna:
+        - list: Os nomes ordenados.
+        """
+
+        stats = self._load()
+
+        def key(name):
+            entry = stats.get(name, {})
+            healthy = entry.get('success_rate', 1.0) >= self.MIN_SUCCESS_RATE
+            latency = entry.get('latency')
+            return (not healthy, latency or 0.0)
+
+        return sorted(names, key=key)
+
+
+def is_valid_pdf(pdf_path):
+    """
+    Verifica se o arquivo existe e tem o cabeçalho e o final de um PDF.
+
+    Retorna:
+    - bool: True se o PDF parece válido.
+    """
+
+    try:
+        size = os.path.getsize(pdf_path)
+        if size == 0:
+            return False
+
+        with open(pdf_path, 'rb') as file:
+            if not file.read(5) == b'%PDF-':
+                return False
+            file.seek(max(size - 1024, 0))
+            return b'%%EOF' in file.read()
+
+    except OSError:
+        return False
+
+
+def _kill_process_tree(process):
+    """Finaliza um subprocesso e os processos que ele criou."""
+
+    try:
+        parent = psutil.Process(process.pid)
+        for child in parent.children(recursive=True):
+            child.kill()
+        parent.kill()
+    except psutil.Error:
+        pass
+
+    process.wait()
+
 
 class PandocInstaller:
     """
@@ -0,0 +1,272 @@
+# title: 'module output'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import base64
+import html
+import json
+import logging
+import os
+import shutil
+
+
+RENDERERS = {}
+
+
+def register_renderer(name, function, needs_screenshot=False, requires=()):
+    """
+    Registra um formato de saída.
+
+    Args:
+        name (str): Nome do formato, usado em config.json ('json', 'html', ...).
+        function (callable): function(data, base_path, context) -> caminho do arquivo ou None.
+        needs_screenshot (bool): Se o formato usa o screenshot da página.
+        requires (tuple): Formatos que precisam ser gerados antes deste.
+    """
+
+    RENDERERS[name] = {
+        'function': function,
+        'needs_screenshot': needs_screenshot,
+        'requires': tuple(requires),
+    }
+
+
+def resolve_formats(formats):
+    """
+    Ordena os formatos pedidos, incluindo os formatos intermediários.
+
+    Returns:
+        list: Formatos na ordem de geração.
+    """
+
+    ordered = []
+
+    def add(name):
+        if name not in RENDERERS:
+            raise ValueError(f'Formato de saída desconhecido: {name}')
+        for required in RENDERERS[name]['requires']:
+            add(required)
+        if name not in ordered:
+            ordered.append(name)
+
+    for name in formats:
+        add(name)
+
+    return ordered
+
+
+def needs_screenshot(formats):
+    """Verifica se algum dos formatos (ou seus intermediários) usa o screenshot."""
+
+    return any(RENDERERS[name]['needs_screenshot'] for name in resolve_formats(formats))
+
+
+def render_outputs(formats, data, report_dir, base_name, author, screenshot_mode='inline',
+                   office_options=None):
+    """
+    Gera os arquivos de saída pedidos.
+
+    Formatos gerados apenas como intermediários (ex.: o .docx para o PDF)
+    são removidos no final.
+
+    Args:
+        formats (list): Formatos pedidos ('json', 'html', 'markdown', 'docx', 'pdf').
+        data (dict): Dados da cotação (quote, today, hour, timestamp, url, screenshot e,
+            opcionalmente, history: linhas data, hora, cotação).
+        report_dir (str): Pasta de destino.
+        base_name (str): Nome dos arquivos, sem extensão.
+        author (str): Autor do relatório.
+        screenshot_mode (str): 'inline' (embutido no HTML) ou 'linked' (arquivo .png ao lado).
+        office_options (dict, optional): Argumentos do Office para a conversão (timeout, race, stats_path).
+    Returns:
+        dict: Mapeia cada formato gerado para o caminho do arquivo ('png' para o screenshot copiado).
+    """
+
+    os.makedirs(report_dir, exist_ok=True)
+
+    context = {
+        'author': author,
+        'screenshot_mode': screenshot_mode,
+        'office_options': office_options or {},
+        'paths': {},
+    }
+    base_path = os.path.join(report_dir, base_name)
+
+    ordered = resolve_formats(formats)
+
+    for name in ordered:
+        try:
+            path = RENDERERS[name]['function'](data, base_path, context)
+        except Exception as e:
+            logging.error(f'Erro ao gerar a saída {name}: {e}')
+            path = None
+
+        if path:
+            context['paths'][name] = path
+
+    for name in ordered:
+        path = context['paths'].get(name)
+        if name not in formats and path and os.path.exists(path):
+            os.remove(path)
+            del context['paths'][name]
+
+    return context['paths']
+
+
+def _quote_value(quote):
+    """Converte 'R$ 5,43' para 5.43."""
+
+    try:
+        return float(quote.replace('R$', '').strip().replace(',', '.'))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _link_screenshot(data, base_path, context):
+    """Copia o screenshot para junto do relatório e retorna o nome do arquivo."""
+
+    screenshot = data.get('screenshot')
+    if not screenshot or not os.path.exists(screenshot):
+        return None
+
+    if 'png' not in context['paths']:
+        shutil.copy(screenshot, base_path + '.png')
+        context['paths']['png'] = base_path + '.png'
+
+    return os.path.basename(base_path + '.png')
+
+
+def render_json(data, base_path, context):
+    """Gera o relatório em JSON, somente com os dados da cotação."""
+
+    path = base_path + '.json'
+    content = {
+        'quote': data['quote'],
+        'value': _quote_value(data['quote']),
+        'date': data['today'],
+        'hour': data['hour'],
+        'timestamp': data['timestamp'],
+        'url': data['url'],
+        'author': context['author'],
+    }
+
+    with open(path, 'w', encoding='utf8') as file:
+        json.dump(content, file, ensure_ascii=False, indent=2)
+
+    logging.info(f'Relatório JSON salvo em: {path}')
+    return path
+
+
+def render_html(data, base_path, context):
+    """Gera o relatório em HTML, com o screenshot embutido ou em arquivo separado."""
+
+    path = base_path + '.html'
+
+    image = ''
+    screenshot = data.get('screenshot')
+    if screenshot and os.path.exists(screenshot):
+        if context['screenshot_mode'] == 'inline':
+            with open(screenshot, 'rb') as file:
+                encoded = base64.b64encode(file.read()).decode('ascii')
+            src = 'data:image/png;base64,' + encoded
+        else:
+            src = _link_screenshot(data, base_path, context)
+        image = f'<p><img src="{html.escape(src)}" alt="Screenshot do site" style="max-width: 100%"></p>\n'
+
+    quote = html.escape(data['quote'])
+    content = (
+        '<!DOCTYPE html>\n'
+        '<html lang="pt-BR">\n'
+        '<head><meta charset="utf-8">'
+        f'<title>Cotação Atual do Dólar - {quote}</title></head>\n'
+        '<body>\n'
+        f'<h1>Cotação Atual do Dólar - {quote} ({html.escape(data["today"])})</h1>\n'
+        f'<p>O dólar está no valor de {quote}, na data {html.escape(data["today"])} '
+        f'às {html.escape(data["hour"])}</p>\n'
+        f'<p>Valor cotado no site <a href="{html.escape(data["url"])}">Banco Central do Brasil.</a></p>\n'
+        f'{image}'
+        f'<p>Cotação feita por: {html.escape(context["author"])}</p>\n'
+        '</body>\n'
+        '</html>\n')
+
+    with open(path, 'w', encoding='utf8') as file:
+        file.write(content)
+
+    logging.info(f'Relatório HTML salvo em: {path}')
+    return path
+
+
+def render_markdown(data, base_path, context):
+    """Gera o relatório em Markdown, com o screenshot em arquivo separado."""
+
+    path = base_path + '.md'
+
+    lines = [
+        f'# Cotação Atual do Dólar - {data["quote"]} ({data["today"]})',
+        '',
+        f'O dólar está no valor de {data["quote"]}, na data {data["today"]} às {data["hour"]}',
+        '',
+        f'Valor cotado no site [Banco Central do Brasil.]({data["url"]})',
+        '',
+    ]
+
+    image = _link_screenshot(data, base_path, context)
+    if image:
+        lines += [f'![Screenshot do site]({image})', '']
+
+    lines.append(f'Cotação feita por: {context["author"]}')
+
+    with open(path, 'w', encoding='utf8') as file:
+        file.write('\n'.join(lines) + '\n')
+
+    logging.info(f'Relatório Markdown salvo em: {path}')
+    return path
+
+
+def render_docx(data, base_path, context):
+    """Gera o relatório em Word (.docx)."""
+
+    # Importados aqui: somente os formatos docx/pdf precisam do python-docx
+    from src.office import Office
+    from src.report import report_content
+
+    path = base_path + '.docx'
+
+    office = Office()
+    office.create_document(os.path.basename(path), path)
+    completed = report_content(
+        office, path, data['quote'], data['today'], data['hour'],
+        data['url'], data['screenshot'], context['author'], data.get('history'))
+
+    # Sem o conteúdo, resta só o documento vazio do create_document: descarta
+    if not completed:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+
+    return path if os.path.exists(path) else None
+
+
+def render_pdf(data, base_path, context):
+    """Converte o relatório .docx para PDF."""
+
+    from src.office import Office
+
+    docx_path = context['paths'].get('docx')
+    if docx_path is None:
+        return None
+
+    if not Office(**context['office_options']).convert_docx_to_pdf(docx_path):
+        return None
+
+    return os.path.splitext(docx_path)[0] + '.pdf'
+
+
+register_renderer('json', render_json)
+register_renderer('html', render_html, needs_screenshot=True)
+register_renderer('markdown', render_markdown, needs_screenshot=True)
+register_renderer('docx', render_docx, needs_screenshot=True)
+register_renderer('pdf', render_pdf, requires=('docx',))
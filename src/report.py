@@ -1,8 +1,8 @@
 # title: 'module report'
 # author: 'Elias Albuquerque'
-# version: '0.1.0'
+# version: '0.2.0'
 # created: '2024-08-10'
-# update: '2024-08-10'
+# update: '2026-10-19'
 
 
 
@@ -13,8 +13,16 @@ from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
 
-def report_content(office_object_module, report_path, quote, today, hour, url, screenshot, author):
-    """Adiciona o conteúdo do relatório ao documento existente."""
+def report_content(office_object_module, report_path, quote, today, hour, url, screenshot, author, history=None):
+    """
+    Adiciona o conteúdo do relatório ao documento existente.
+
+    Se history for informado (lista de linhas data, hora, cotação), inclui
+    uma tabela com o histórico das cotações.
+
+    Retorna:
+    - bool: True se o conteúdo foi adicionado e o documento salvo.
+    """
 
     try:
         doc = Document(report_path)
@@ -61,11 +69,18 @@ def report_content(office_object_module, report_path, quote, today, hour, url, s
         paragraph_blank.paragraph_format.space_before = Pt(7)
         doc.add_paragraph("Cotação feita por: " + author, style='MyParagraphStyle')
 
+        # Adiciona a tabela de histórico (gerada em bloco pelo Office)
+        if history:
+            doc.add_paragraph("Histórico de cotações", style='Heading 2')
+            office_object_module.add_table(doc, history, header=["Data", "Hora", "Cotação"])
+
         # Salva o documento após adicionar todo o conteúdo
         # file_path = os.path.join('reports', 'teste.docx')
         doc.save(report_path)
 
-        logging.info(f"Conteúdo adicionado ao arquivo e salvo em: .\\{report_path}")
+        logging.info(f"Conteúdo adicionado ao arquivo e salvo em: {report_path}")
+        return True
 
     except Exception as e:
         logging.error(f"Erro ao adicionar conteúdo ao documento: {e}")
+        return False
@@ -0,0 +1,222 @@
+# title: 'module server'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class TTLCache:
+    """
+    Cache em memória com prazo de validade (TTL) por chave.
+
+    Quando uma chave está vencida, somente a primeira requisição executa o
+    loader; as requisições concorrentes para a mesma chave aguardam e recebem
+    o mesmo resultado (ou o mesmo erro).
+
+    Uso:
+
+        cache = TTLCache(ttl=300)
+        value = cache.get('quote', load_quote)
+    """
+
+    def __init__(self, ttl):
+        """
+        Args:
+            ttl (float): Segundos de validade de cada valor.
+        """
+
+        self.ttl = ttl
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def peek(self, key):
+        """
+        Retorna o valor em cache sem carregar.
+
+        Returns:
+            tuple: (valor, idade em segundos), ou (None, None) se não houver valor.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        return entry[1], time.monotonic() - entry[0]
+
+    def get(self, key, loader, is_valid=None):
+        """
+        Retorna o valor da chave, carregando-o com loader() se estiver vencido.
+
+        Args:
+            key: A chave do cache.
+            loader (callable): Função sem argumentos que produz o novo valor.
+            is_valid (callable, optional): Validação extra do valor em cache.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                if is_valid is None or is_valid(entry[1]):
+                    return entry[1]
+
+        return self.refresh(key, loader)
+
+    def refresh(self, key, loader):
+        """Força o carregamento da chave, agrupando chamadas concorrentes."""
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = {'event': threading.Event()}
+
+        if not leader:
+            call['event'].wait()
+        else:
+            try:
+                value = loader()
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), value)
+                call['value'] = value
+            except Exception as e:
+                call['error'] = e
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+                call['event'].set()
+
+        if 'error' in call:
+            raise call['error']
+        return call['value']
+
+
+class QuoteService:
+    """
+    Serviço HTTP local que expõe a cotação mais recente.
+
+    Endpoints:
+    - GET /quote: Cotação em JSON, servida do cache em memória.
+    - GET /report: Relatório em PDF da cotação em cache, gerado sob demanda.
+
+    Uma thread em segundo plano recarrega a cotação antes do TTL vencer, de
+    modo que as requisições normalmente não esperam pelo navegador.
+    """
+
+    def __init__(self, quote_loader, report_builder, ttl=300, refresh_interval=None):
+        """
+        Args:
+            quote_loader (callable): Função que extrai a cotação e retorna o dict de dados.
+            report_builder (callable): Função report_builder(data) que retorna o caminho do PDF.
+            ttl (float): Segundos de validade da cotação em cache.
+            refresh_interval (float, optional): Intervalo do refresh em segundo plano. Padrão 80% do TTL.
+        """
+
+        self.quote_loader = quote_loader
+        self.report_builder = report_builder
+        self.refresh_interval = refresh_interval or ttl * 0.8
+        self.quotes = TTLCache(ttl)
+        self.reports = TTLCache(float('inf'))
+        self._stop = threading.Event()
+
+    def get_quote(self):
+        return self.quotes.get('quote', self.quote_loader)
+
+    def get_report(self):
+        """Retorna o caminho do PDF da cotação atual, gerando-o se necessário."""
+
+        data = self.get_quote()
+        return self.reports.get(
+            'report',
+            lambda: (data['timestamp'], self.report_builder(data)),
+            is_valid=lambda report: report[0] == data['timestamp'])[1]
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.quotes.refresh('quote', self.quote_loader)
+            except Exception as e:
+                logging.error(f'Erro ao atualizar a cotação em segundo plano: {e}')
+            self._stop.wait(self.refresh_interval)
+
+    def serve(self, host='127.0.0.1', port=8080):
+        """Inicia o refresh em segundo plano e atende as requisições até Ctrl+C."""
+
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+
+        httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        logging.info(f'Servidor disponível em http://{host}:{port} (/quote, /report)')
+
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            logging.warning('Servidor interrompido.')
+        finally:
+            self._stop.set()
+            httpd.server_close()
+
+
+def _make_handler(service):
+    """Cria a classe de handler HTTP ligada ao serviço."""
+
+    class QuoteRequestHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].rstrip('/')
+
+            try:
+                if path == '/quote':
+                    self._send_quote()
+                elif path == '/report':
+                    self._send_report()
+                else:
+                    self._send_json(404, {'error': 'não encontrado'})
+
+            except Exception as e:
+                logging.error(f'Erro ao atender {self.path}: {e}')
+                self._send_json(503, {'error': str(e)})
+
+        def _send_quote(self):
+            data = service.get_quote()
+            _, age = service.quotes.peek('quote')
+
+            body = {key: value for key, value in data.items() if key != 'screenshot'}
+            body['age_seconds'] = round(age or 0, 1)
+            self._send_json(200, body)
+
+        def _send_report(self):
+            pdf_path = service.get_report()
+
+            with open(pdf_path, 'rb') as file:
+                content = file.read()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header(
+                'Content-Disposition', f'inline; filename="{os.path.basename(pdf_path)}"')
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _send_json(self, status, body):
+            content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            logging.debug(f'{self.address_string()} - {format % args}')
+
+    return QuoteRequestHandler
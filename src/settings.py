@@ -1,8 +1,8 @@
 # title: 'module settings to inittiate logging and webdriver'
 # author: 'Elias Albuquerque'
-# version: '0.1.1'
+# version: '0.2.0'
 # created: '2024-08-08'
-# update: '2024-08-08'
+# update: '2026-10-19'
 
 
 import os
@@ -14,6 +14,46 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, ElementNotVisibleException, ElementNotSelectableException
+from src.governor import ResourceGovernor
+
+
+def get_log_dir():
+    """
+    Retorna o caminho absoluto da pasta 'log' na raiz do projeto (ou ao lado
+    do executável), criando-a se não existir.
+    """
+
+    if getattr(sys, 'frozen', False): 
+        log_dir = os.path.join(os.path.dirname(sys.executable), '.', 'log')
+    else: 
+        log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'log')
+
+    # Cria a pasta 'log' se não existir
+    os.makedirs(log_dir, exist_ok=True) 
+
+    return log_dir
+
+
+def setup_logging():
+    """
+    Configura o logging da aplicação utilizando o arquivo 'config.ini'.
+
+    Pode ser chamada sem iniciar o driver do Chrome (ex.: produtor da fila).
+
+    Returns:
+        str: O caminho da pasta 'log'.
+    """
+
+    # Define o caminho absoluto para o arquivo 'config.ini'
+    config_path = os.path.join(os.path.dirname(__file__), 'config.ini')
+
+    # Define o caminho absoluto para a pasta 'log' na raiz do projeto
+    log_dir = get_log_dir()
+
+    # Configura o logging utilizando o arquivo 'config.ini'
+    logging.config.fileConfig(config_path, disable_existing_loggers=False)
+
+    return log_dir
 
 
 class Settings:     
@@ -26,50 +66,102 @@ class Settings:
 
     A classe Settings fornece métodos para acessar o driver do Chrome, o objeto wait e realizar o setup do logging.
 
+    O navegador é finalizado ao sair do bloco with (ou com quit()), e um
+    ResourceGovernor acompanha a memória e os processos da árvore do Chrome.
+
     Uso:
 
         from settings import Settings
 
-        settings = Settings()
+        with Settings() as settings:
+            # Acessando o driver do Chrome
+            driver = settings.driver
 
-        # Acessando o driver do Chrome
-        driver = settings.driver
+            # Acessando o objeto wait
+            wait = settings.wait
 
-        # Acessando o objeto wait
-        wait = settings.wait
+            # Reinicia o navegador se passou dos limites de memória
+            settings.ensure_healthy()
 
         # Usando o logging
         logging.info("Mensagem de log")
     """
     
-    def __init__(self):
-        self._setup_logging()
+    def __init__(self, browser_config=None):
+        """
+        Args:
+            browser_config (dict, optional): Limites do navegador ('max_rss_mb', 'max_children').
+
+        Raises:
+            RuntimeError: Se o driver do Chrome não puder ser iniciado.
+        """
+
+        log_dir = setup_logging()
 
         logging.warning('Aplicação Iniciada.')
         logging.info('Iniciando configurações da aplicação...')
-        
+
+        browser_config = browser_config or {}
+        self.governor = ResourceGovernor(
+            log_dir,
+            max_rss_mb=browser_config.get('max_rss_mb', 1500),
+            max_children=browser_config.get('max_children', 40))
+        self.governor.kill_orphans()
+
+        self.driver = None
+        self.wait = None
+        self.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit()
+
+    def start(self):
+        """Inicia o navegador e o objeto wait."""
+
         self.driver = self._setup_driver()
-        self.wait = self._setup_wait()
+        if self.driver is None:
+            raise RuntimeError('Não foi possível iniciar o driver do Chrome.')
 
-    def _setup_logging(self):
-        """
-        Configura o logging da aplicação utilizando o arquivo 'config.ini'.
-        """
+        self.wait = self._setup_wait()
+        self.governor.register(self.driver)
 
-        # Define o caminho absoluto para o arquivo 'config.ini'
-        config_path = os.path.join(os.path.dirname(__file__), 'config.ini')
+    def quit(self):
+        """Finaliza o navegador e qualquer processo da árvore que tenha sobrado."""
 
-        # Define o caminho absoluto para a pasta 'log' na raiz do projeto
-        if getattr(sys, 'frozen', False): 
-            log_dir = os.path.join(os.path.dirname(sys.executable), '.', 'log')
-        else: 
-            log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'log')
+        if self.driver is None:
+            return
 
-        # Cria a pasta 'log' se não existir
-        os.makedirs(log_dir, exist_ok=True) 
+        logging.info('Finalizando o navegador...')
 
-        # Configura o logging utilizando o arquivo 'config.ini'
-        logging.config.fileConfig(config_path, disable_existing_loggers=False)
+        # A árvore é lida antes do quit(): depois o chromedriver já terminou
+        processes = self.governor.snapshot()
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.error(f'Erro ao finalizar o driver: {e}')
+        finally:
+            self.governor.kill_processes(processes)
+            self.governor.unregister()
+            self.driver = None
+            self.wait = None
+
+    def recycle(self):
+        """Reinicia o navegador, liberando a memória acumulada."""
+
+        logging.warning('Reiniciando o navegador...')
+        self.quit()
+        self.start()
+
+    def ensure_healthy(self):
+        """Reinicia o navegador se ele passou dos limites de memória ou de processos."""
+
+        if self.driver is None:
+            self.start()
+        elif self.governor.over_limits():
+            self.recycle()
 
     def _setup_driver(self):
         """Configura o driver do Chrome."""
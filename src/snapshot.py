@@ -0,0 +1,116 @@
+# title: 'module snapshot'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import datetime
+import json
+import logging
+import os
+import shutil
+import uuid
+
+
+def new_run_id(now=None):
+    """
+    Gera um identificador único de execução: AAAAMMDD-HHMMSS-xxxxxxxx.
+    """
+
+    now = now or datetime.datetime.now()
+    return now.strftime('%Y%m%d-%H%M%S') + '-' + uuid.uuid4().hex[:8]
+
+
+class SnapshotStore:
+    """
+    Guarda, por execução, o HTML da página, os valores extraídos e o
+    screenshot, para que os relatórios possam ser refeitos sem navegador.
+
+    Estrutura:
+
+        snapshots/<run_id>/page.html
+        snapshots/<run_id>/screenshot.png
+        snapshots/<run_id>/values.json
+
+    Uso:
+
+        store = SnapshotStore('snapshots')
+        recorder = store.recorder(run_id)
+        website = Website(settings, recorder)
+        ...
+        snapshot = store.load(run_id)
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def recorder(self, run_id):
+        return SnapshotRecorder(os.path.join(self.root, run_id), run_id)
+
+    def load(self, run_id):
+        """
+        Carrega a snapshot de uma execução.
+
+        Returns:
+            dict: Os dados gravados (values.json), com 'screenshot' apontando
+            para o screenshot da snapshot (ou None).
+        Raises:
+            FileNotFoundError: Se a snapshot não existir ou estiver incompleta.
+        """
+
+        run_dir = os.path.join(self.root, run_id)
+        with open(os.path.join(run_dir, 'values.json'), 'r', encoding='utf8') as file:
+            snapshot = json.load(file)
+
+        screenshot = os.path.join(run_dir, 'screenshot.png')
+        snapshot['data']['screenshot'] = screenshot if os.path.exists(screenshot) else None
+
+        return snapshot
+
+
+class SnapshotRecorder:
+    """
+    Grava a snapshot de uma execução. Usado pelo Website durante o scraping.
+    """
+
+    def __init__(self, run_dir, run_id):
+        self.run_dir = run_dir
+        self.run_id = run_id
+        self.values = {}
+
+        os.makedirs(run_dir, exist_ok=True)
+
+    def record_page(self, url, driver):
+        """Grava o HTML da página carregada no driver."""
+
+        html = driver.page_source
+        self.values['page_url'] = url
+        with open(os.path.join(self.run_dir, 'page.html'), 'w', encoding='utf8') as file:
+            file.write(html)
+
+    def record_value(self, name, value):
+        """Guarda um valor extraído da página."""
+
+        self.values[name] = value
+
+    def record_screenshot(self, screenshot_path):
+        """Copia o screenshot da execução."""
+
+        shutil.copy(screenshot_path, os.path.join(self.run_dir, 'screenshot.png'))
+
+    def save(self, data):
+        """
+        Grava os valores extraídos e os dados do relatório. A snapshot só é
+        considerada completa (e pode ser usada no replay) após este passo.
+        """
+
+        data = {key: value for key, value in data.items() if key != 'screenshot'}
+        snapshot = {'run_id': self.run_id, 'values': self.values, 'data': data}
+
+        temp_path = os.path.join(self.run_dir, 'values.json.tmp')
+        with open(temp_path, 'w', encoding='utf8') as file:
+            json.dump(snapshot, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, os.path.join(self.run_dir, 'values.json'))
+
+        logging.info(f'Snapshot da execução gravada: {self.run_id}')
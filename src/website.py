@@ -1,8 +1,8 @@
 # title: 'website'
 # author: 'Elias Albuquerque'
-# version: '0.1.1'
+# version: '0.2.0'
 # created: '2024-08-08'
-# update: '2024-08-09'
+# update: '2026-10-19'
 
 import logging
 import tempfile
@@ -19,15 +19,42 @@ class Website:
     Classe para interagir com um site web usando Selenium.
     """
 
-    def __init__(self, settings):
+    def __init__(self, settings, recorder=None):
         """
         Inicializa a classe Website com o driver e a configuração de espera.
         Args:
             settings: Um objeto que contém as configurações do driver e da espera.
+            recorder (SnapshotRecorder, optional): Grava o HTML, os valores
+                extraídos e o screenshot da execução para replay.
         """
 
-        self.driver = settings.driver
-        self.wait = settings.wait
+        self.settings = settings
+        self.recorder = recorder
+
+    @property
+    def driver(self):
+        # Lido das configurações a cada uso: o navegador pode ter sido reiniciado
+        return self.settings.driver
+
+    @property
+    def wait(self):
+        return self.settings.wait
+
+    def save_snapshot(self, data):
+        """Finaliza a snapshot da execução com os dados do relatório, se houver gravador."""
+
+        self._record('save', data)
+
+    def _record(self, method, *args):
+        """Repassa os dados ao gravador de snapshots, sem interromper o scraping."""
+
+        if self.recorder is None:
+            return
+
+        try:
+            getattr(self.recorder, method)(*args)
+        except (OSError, WebDriverException) as e:
+            logging.error(f'Erro ao gravar a snapshot: {e}')
 
     def access_website(self, url):
         """
@@ -43,6 +70,7 @@ class Website:
         try:
             self.driver.get(url)
             sleep(15)
+            self._record('record_page', url, self.driver)
             return self.driver
 
         except TimeoutException as e:
@@ -85,7 +113,9 @@ class Website:
             element = self.wait.until(
                 EC.presence_of_element_located((By.XPATH, xpath_element))
             )
-            return element.text
+            text = element.text
+            self._record('record_value', data_to_extract, text)
+            return text
 
         except TimeoutException as e:
             logging.error(f'Erro ao extrair {data_to_extract} do elemento: {e}')
@@ -109,6 +139,7 @@ class Website:
             element = self.wait.until(
                 EC.visibility_of_element_located((By.XPATH, xpath_element))
             ).get_attribute(attribute)
+            self._record('record_value', data_to_extract, element)
             return element
 
         except TimeoutException as e:
@@ -143,6 +174,7 @@ class Website:
             file_path = os.path.join(tempdir, file_name)
 
             self.driver.save_screenshot(file_path)
+            self._record('record_screenshot', file_path)
 
             return file_path
 
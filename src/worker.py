@@ -0,0 +1,127 @@
+# title: 'module worker'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import logging
+import os
+import socket
+import threading
+import time
+
+
+class Worker:
+    """
+    Consome jobs de uma JobQueue e executa o handler de cada tipo de job.
+
+    Enquanto um job executa, uma thread renova o lease periodicamente, até o
+    limite de max_job_seconds. Depois disso o lease deixa de ser renovado e
+    expira, e o job de um worker travado ou morto volta para a fila.
+
+    Uso:
+
+        worker = Worker(queue, {'scrape': handle_scrape, 'report': handle_report})
+        worker.run()
+    """
+
+    def __init__(self, queue, handlers, worker_id=None, poll_interval=5, max_job_seconds=1800):
+        """
+        Args:
+            queue (JobQueue): A fila de jobs.
+            handlers (dict): Mapeia o tipo do job para uma função handler(job) -> resultado.
+            worker_id (str, optional): Identificador do worker. Padrão 'host-pid'.
+            poll_interval (float): Segundos de espera quando a fila está vazia.
+            max_job_seconds (float): Tempo máximo de um job; após esse prazo o
+                lease não é mais renovado.
+        """
+
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.max_job_seconds = max_job_seconds
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Solicita a parada do worker após o job atual."""
+
+        self._stop.set()
+
+    def run(self, drain=False):
+        """
+        Executa o loop do worker.
+
+        Args:
+            drain (bool): Se True, encerra quando a fila ficar vazia.
+        """
+
+        logging.info(f'Worker {self.worker_id} iniciado.')
+
+        while not self._stop.is_set():
+            job = self.queue.claim(self.worker_id)
+
+            if job is None:
+                if drain:
+                    break
+                self._stop.wait(self.poll_interval)
+                continue
+
+            self.execute(job)
+
+        logging.info(f'Worker {self.worker_id} finalizado.')
+
+    def execute(self, job):
+        """
+        Executa um job já reservado e registra o resultado ou a falha.
+
+        Returns:
+            bool: True se o job foi concluído com sucesso.
+        """
+
+        logging.info(f'Executando job {job["id"]} ({job["kind"]}), tentativa {job["attempts"]}...')
+
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            logging.error(f'Tipo de job desconhecido: {job["kind"]}')
+            self.queue.fail(job['id'], self.worker_id, f'tipo desconhecido: {job["kind"]}')
+            return False
+
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._keep_lease, args=(job['id'], done), daemon=True)
+        heartbeat.start()
+
+        try:
+            result = handler(job)
+
+        except Exception as e:
+            logging.error(f'Erro no job {job["id"]}: {e}')
+            self.queue.fail(job['id'], self.worker_id, e)
+            return False
+
+        finally:
+            done.set()
+            heartbeat.join()
+
+        return self.queue.complete(job['id'], self.worker_id, result)
+
+    def _keep_lease(self, job_id, done):
+        """
+        Renova o lease do job a cada terço do prazo até o job terminar ou
+        passar de max_job_seconds (handler travado).
+        """
+
+        interval = max(self.queue.lease_seconds / 3, 1)
+        deadline = time.monotonic() + self.max_job_seconds
+
+        while not done.wait(interval):
+            if time.monotonic() >= deadline:
+                logging.error(
+                    f'Job {job_id} passou de {self.max_job_seconds}s. '
+                    'O lease não será mais renovado e o job voltará para a fila.')
+                return
+            if not self.queue.heartbeat(job_id, self.worker_id):
+                logging.warning(f'Lease do job {job_id} perdido durante a execução.')
+                return
@@ -0,0 +1,114 @@
+# title: 'module workspace'
+# author: 'Elias Albuquerque'
+# version: '0.1.0'
+# created: '2026-10-19'
+# update: '2026-10-19'
+
+
+import errno
+import logging
+import os
+import shutil
+import tempfile
+from src.snapshot import new_run_id
+
+
+# Memória compartilhada (tmpfs) no Linux: os arquivos intermediários ficam na RAM
+RAM_DIR = '/dev/shm'
+
+
+class Workspace:
+    """
+    Pasta de trabalho exclusiva de uma execução, para os arquivos
+    intermediários (screenshot, .docx, PDF em conversão).
+
+    Fica em /dev/shm quando disponível e, caso contrário, na pasta temporária
+    do sistema. Os arquivos finais são publicados no destino com rename
+    atômico, então execuções em paralelo nunca sobrescrevem nem expõem
+    arquivos pela metade.
+
+    Uso:
+
+        with Workspace(run_id) as workspace:
+            screenshot = website.take_screenshot(workspace.path)
+            ...
+            workspace.publish(pdf_path, 'reports')
+    """
+
+    def __init__(self, run_id=None):
+        """
+        Args:
+            run_id (str, optional): Identificador da execução. Padrão: um novo id único.
+        """
+
+        self.run_id = run_id or new_run_id()
+
+        base_dir = RAM_DIR if os.path.isdir(RAM_DIR) and os.access(RAM_DIR, os.W_OK) else None
+        self.path = tempfile.mkdtemp(prefix=f'scraper-{self.run_id}-', dir=base_dir)
+        logging.debug(f'Pasta de trabalho da execução: {self.path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    def subdir(self, name):
+        """Cria (se necessário) e retorna uma subpasta da pasta de trabalho."""
+
+        path = os.path.join(self.path, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def publish(self, src, dest_dir, name=None):
+        """
+        Move um arquivo da pasta de trabalho para o destino de forma atômica.
+
+        Se o destino estiver em outro sistema de arquivos (ex.: /dev/shm ->
+        disco), o arquivo é copiado para um nome temporário oculto na pasta de
+        destino e então renomeado.
+
+        Returns:
+            str: O caminho do arquivo publicado.
+        """
+
+        os.makedirs(dest_dir, exist_ok=True)
+        name = name or os.path.basename(src)
+        dest = os.path.join(dest_dir, name)
+
+        try:
+            os.replace(src, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+            partial = os.path.join(dest_dir, f'.{name}.{self.run_id}.partial')
+            try:
+                shutil.copyfile(src, partial)
+                os.replace(partial, dest)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            os.remove(src)
+
+        return dest
+
+    def publish_all(self, paths, dest_dir):
+        """
+        Publica vários arquivos.
+
+        Args:
+            paths (dict): Mapeia o formato para o caminho na pasta de trabalho.
+        Returns:
+            dict: Mapeia o formato para o caminho publicado.
+        """
+
+        published = {name: self.publish(path, dest_dir) for name, path in paths.items()}
+
+        for path in published.values():
+            logging.info(f'Relatório publicado em: {path}')
+
+        return published
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)